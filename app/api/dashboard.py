@@ -0,0 +1,24 @@
+# app/api/dashboard.py
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import get_settings
+from app.db import get_db
+from app.dependencies import require_auth
+from app.models import LeaderWallet
+from app.schemas import DashboardOut
+
+router = APIRouter(prefix="/api", dependencies=[Depends(require_auth)])
+
+@router.get("/dashboard", response_model=DashboardOut)
+async def dashboard_data(response: Response, db: AsyncSession = Depends(get_db)):
+    wallets = (await db.execute(select(LeaderWallet))).scalars().all()
+    s = await get_settings(db)
+
+    # Absorb refresh bursts from the same browser without going back to the DB
+    response.headers["Cache-Control"] = "private, max-age=5"
+    return DashboardOut(
+        wallets=wallets,
+        settings=s,
+        active_count=sum(1 for w in wallets if w.is_active),
+    )
@@ -0,0 +1,60 @@
+# app/api/settings.py
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import SETTINGS_ID, invalidate_settings
+from app.db import get_db, dialect_insert
+from app.dependencies import require_auth
+from app.events import emit_bot_status, log_event
+from app.models import SettingsSingleton
+from app.schemas import SettingsUpdate
+
+router = APIRouter(prefix="/api", dependencies=[Depends(require_auth)])
+
+BOT_ACTIONS = {"start": "RUNNING", "stop": "STOPPED", "pause": "PAUSED"}
+
+@router.post("/bot/{action}")
+async def control_bot(action: str, db: AsyncSession = Depends(get_db)):
+    status = BOT_ACTIONS.get(action)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Unknown bot action: {action}")
+
+    # One conditional UPDATE: matches only if the status actually changes, so two
+    # simultaneous /start clicks can't both succeed
+    current = SettingsSingleton.global_trading_status
+    changed = (await db.execute(
+        update(SettingsSingleton)
+        .where(SettingsSingleton.id == SETTINGS_ID, or_(current.is_(None), current != status))
+        .values(global_trading_status=status)
+        .returning(SettingsSingleton.id)
+    )).scalar_one_or_none()
+    if changed is None:
+        # Either already in that state, or the settings row hasn't been seeded yet
+        changed = (await db.execute(
+            dialect_insert(SettingsSingleton)
+            .values(id=SETTINGS_ID, global_trading_status=status)
+            .on_conflict_do_nothing(index_elements=["id"])
+            .returning(SettingsSingleton.id)
+        )).scalar_one_or_none()
+        if changed is None:
+            raise HTTPException(status_code=400, detail=f"Bot is already {status}")
+
+    # Commit before dropping the cache so a concurrent dashboard can't re-cache the old row
+    await db.commit()
+    invalidate_settings()
+    log_event(f"bot_{action}", f"Bot status set to {status}")
+    await emit_bot_status(status)
+    return {"status": status}
+
+@router.post("/settings")
+async def update_settings(body: SettingsUpdate, db: AsyncSession = Depends(get_db)):
+    values = body.model_dump(exclude_none=True)
+    if not values:
+        raise HTTPException(status_code=400, detail="No settings to update")
+
+    # One UPDATE of just the submitted columns — no load, no ORM change tracking
+    await db.execute(update(SettingsSingleton).where(SettingsSingleton.id == SETTINGS_ID).values(**values))
+    await db.commit()
+    invalidate_settings()
+    log_event("settings_updated", "Settings updated: " + ", ".join(sorted(values)))
+    return {"updated": sorted(values)}
@@ -0,0 +1,100 @@
+# app/api/status.py
+import hashlib
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_db
+from app.dependencies import require_auth
+from app.models import FollowerTrade, LeaderWallet, Position, SystemEvent, TradeStats
+from app.schemas import FollowerTradeOut, StatsOut, SystemEventOut
+
+router = APIRouter(prefix="/api", dependencies=[Depends(require_auth)])
+
+PAGE_SIZE = 50
+
+def _page(model, out, after_id: Optional[int]):
+    # Keyset pagination on the PK: newest first, then ?after_id=<last id seen> for older rows.
+    # The PK index serves both the filter and the ORDER BY, so no re-sort of the table per poll.
+    # Only the columns the DTO exposes are selected — plain rows, no ORM instances
+    columns = [getattr(model, name) for name in out.model_fields]
+    stmt = select(*columns).order_by(model.id.desc()).limit(PAGE_SIZE)
+    if after_id is not None:
+        stmt = stmt.where(model.id < after_id)
+    return stmt
+
+class _CachedBody:
+    """One pre-encoded JSON body per worker, re-queried at most once per `ttl` seconds
+    and served with an ETag so unchanged polls get a bodyless 304."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.body = b""
+        self.etag = ""
+        self.loaded_at = 0.0
+
+    def fresh(self) -> bool:
+        return bool(self.body) and time.monotonic() - self.loaded_at <= self.ttl
+
+    def store(self, payload):
+        self.body = orjson.dumps(payload)
+        self.etag = '"%s"' % hashlib.blake2b(self.body, digest_size=8).hexdigest()
+        self.loaded_at = time.monotonic()
+
+    def invalidate(self):
+        self.body = b""
+
+    def respond(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": "private, no-cache"}
+        if request.headers.get("if-none-match") == self.etag:
+            return Response(status_code=304, headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+# The dashboard polls both; events are append-only, so they can sit a little longer
+stats_cache = _CachedBody(ttl=2.0)
+events_cache = _CachedBody(ttl=5.0)
+
+async def _load_stats(db: AsyncSession) -> StatsOut:
+    start_of_day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    # Every figure comes back from one SELECT — a single round-trip. The all-time total is
+    # the executor's running counter; "today" is an index range scan on executed_at
+    total = select(TradeStats.total_trades).where(TradeStats.id == 1).scalar_subquery()
+    today = (
+        select(func.count(FollowerTrade.id)).where(FollowerTrade.executed_at >= start_of_day).scalar_subquery()
+    )
+    active_wallets = (
+        select(func.count(LeaderWallet.id)).where(LeaderWallet.is_active.is_(True)).scalar_subquery()
+    )
+    unrealized = select(func.coalesce(func.sum(Position.unrealized_pnl), 0.0)).scalar_subquery()
+
+    row = (await db.execute(select(func.coalesce(total, 0), today, active_wallets, unrealized))).one()
+    return StatsOut(
+        total_trades=row[0],
+        trades_today=row[1],
+        active_wallets=row[2],
+        unrealized_pnl=row[3],
+    )
+
+@router.get("/stats", response_model=StatsOut)
+async def get_stats(request: Request, db: AsyncSession = Depends(get_db)):
+    if not stats_cache.fresh():
+        stats_cache.store((await _load_stats(db)).model_dump())
+    return stats_cache.respond(request)
+
+@router.get("/trades", response_model=List[FollowerTradeOut])
+async def list_trades(after_id: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    return (await db.execute(_page(FollowerTrade, FollowerTradeOut, after_id))).all()
+
+@router.get("/events", response_model=List[SystemEventOut])
+async def list_events(request: Request, after_id: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    if after_id is not None:
+        # Older pages never change and are rarely asked for twice — no point caching them
+        return (await db.execute(_page(SystemEvent, SystemEventOut, after_id))).all()
+    if not events_cache.fresh():
+        rows = await db.execute(_page(SystemEvent, SystemEventOut, None))
+        events_cache.store([SystemEventOut.model_validate(row).model_dump() for row in rows])
+    return events_cache.respond(request)
@@ -0,0 +1,52 @@
+# app/api/wallets.py
+import re
+from typing import List
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_db, dialect_insert
+from app.api.status import stats_cache
+from app.dependencies import redirect_home, require_auth
+from app.models import LeaderTrade, LeaderWallet
+from app.schemas import WalletTradesOut
+
+router = APIRouter(prefix="/api", dependencies=[Depends(require_auth)])
+
+_ADDR_RE = re.compile(r"^0x[0-9a-f]{40}$")
+
+@router.get("/wallets", response_model=List[WalletTradesOut])
+async def list_wallets(db: AsyncSession = Depends(get_db)):
+    # Trade counts come from one GROUP BY instead of a COUNT per wallet. Plain columns,
+    # not entities, so there is nothing that could lazy-load its way back into an N+1
+    rows = await db.execute(
+        select(
+            LeaderWallet.id,
+            LeaderWallet.address,
+            LeaderWallet.nickname,
+            LeaderWallet.is_active,
+            LeaderWallet.added_at,
+            func.count(LeaderTrade.id).label("trade_count"),
+        )
+        .outerjoin(LeaderTrade, LeaderTrade.wallet_id == LeaderWallet.id)
+        .group_by(LeaderWallet.id)
+        .order_by(LeaderWallet.id)
+    )
+    return [WalletTradesOut.model_validate(row) for row in rows]
+
+@router.post("/wallets/add")
+async def add_wallet(request: Request, db: AsyncSession = Depends(get_db)):
+    form = await request.form()
+    address = form.get("address", "").strip().lower()
+    if not _ADDR_RE.match(address):
+        return redirect_home()
+
+    # Idempotent single-statement insert — the unique index on address handles duplicates
+    await db.execute(
+        dialect_insert(LeaderWallet)
+        .values(address=address, nickname=form.get("nickname", "").strip() or None, is_active=True)
+        .on_conflict_do_nothing(index_elements=["address"])
+    )
+    await db.commit()
+    # Active-wallet count just changed; don't let the next poll serve the cached one
+    stats_cache.invalidate()
+    return redirect_home()
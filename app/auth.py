@@ -0,0 +1,102 @@
+# app/auth.py
+import asyncio
+import hashlib
+import hmac
+import time
+from typing import Dict, Optional
+from starlette.authentication import AuthCredentials, AuthenticationBackend, SimpleUser
+from app.config import settings
+
+# The one password context — main.py, reset_admin.py and scripts/ all hash through it.
+# Built on first use, so workers that never see a login (and warm restarts with the
+# admin already seeded) don't import passlib/argon2 or hash the dummy password
+_pwd_context = None
+# Unknown usernames are verified against this so a miss costs as much as a hit
+_dummy_hash = None
+
+def pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(
+            schemes=["argon2"],
+            deprecated="auto",
+            argon2__rounds=settings.ARGON2_ROUNDS,
+            argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+        )
+    return _pwd_context
+
+def hash_password(password: str) -> str:
+    return pwd_context().hash(password)
+
+def verify_password(password: str, password_hash: Optional[str]) -> bool:
+    global _dummy_hash
+    if password_hash is None:
+        if _dummy_hash is None:
+            _dummy_hash = hash_password("not-a-real-password")
+        pwd_context().verify(password, _dummy_hash)
+        return False
+    return pwd_context().verify(password, password_hash)
+
+# Successful verifications only, keyed by HMAC(password, hash) — never the plaintext.
+# Failures always pay full argon2 so the cache can't speed up guessing.
+_VERIFIED_TTL = 300.0
+_VERIFIED_MAX = 1024
+_verified: Dict[bytes, float] = {}
+
+def _verify_key(password: str, password_hash: str) -> bytes:
+    msg = password.encode() + b"\0" + password_hash.encode()
+    return hmac.new(settings.SECRET_KEY.encode(), msg, hashlib.sha256).digest()
+
+async def verify_password_async(password: str, password_hash: Optional[str]) -> bool:
+    key = None
+    if password_hash is not None:
+        key = _verify_key(password, password_hash)
+        expires = _verified.get(key)
+        if expires is not None and expires > time.monotonic():
+            return True
+    # argon2 is CPU-bound (and releases the GIL) — keep it off the event loop
+    ok = await asyncio.to_thread(verify_password, password, password_hash)
+    if ok and key is not None:
+        if len(_verified) >= _VERIFIED_MAX:
+            _verified.clear()
+        _verified[key] = time.monotonic() + _VERIFIED_TTL
+    return ok
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.to_thread(hash_password, password)
+
+# Routes that never look at request.user — skip the session lookup for them
+_PUBLIC_PREFIXES = ("/static", "/health")
+
+class SessionAuthBackend(AuthenticationBackend):
+    """Resolves request.user once per request from the signed session cookie."""
+
+    async def authenticate(self, conn):
+        if conn.url.path.startswith(_PUBLIC_PREFIXES):
+            return None
+        if conn.session.get("authenticated"):
+            return AuthCredentials(["authenticated"]), SimpleUser(conn.session.get("username", ""))
+        return None
+
+# Paths the gate rejects before routing; the route-level checks stay as a second line
+_PROTECTED_EXACT = ("/",)
+_PROTECTED_PREFIXES = ("/api/",)
+_LOGIN_REDIRECT_HEADERS = [(b"location", b"/login"), (b"content-length", b"0")]
+
+class AuthGate:
+    """Pure-ASGI gate: unauthenticated hits on protected paths get a 307 to /login
+    straight from the session scope, without routing or dependency resolution."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            path = scope["path"]
+            if (path in _PROTECTED_EXACT or path.startswith(_PROTECTED_PREFIXES)) \
+                    and not scope["session"].get("authenticated"):
+                await send({"type": "http.response.start", "status": 307, "headers": _LOGIN_REDIRECT_HEADERS})
+                await send({"type": "http.response.body", "body": b""})
+                return
+        await self.app(scope, receive, send)
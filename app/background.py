@@ -1,9 +1,31 @@
 # app/background.py
 import asyncio
+import fcntl
+import logging
+from app.config import settings
 from app.wallet_monitor import monitor_wallets
 from app.executor import execute_trades
 
+logger = logging.getLogger(__name__)
+
+# Held open for the life of the process; the flock is dropped when the worker exits
+_lock_file = None
+
 def start_background_tasks():
-    asyncio.create_task(monitor_wallets())
-    asyncio.create_task(execute_trades())
-    print("Background tasks started: monitor + executor")
\ No newline at end of file
+    global _lock_file
+    # With several uvicorn workers only one may poll + execute, or leader trades get copied twice
+    lock = open(settings.BACKGROUND_LOCK, "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock.close()
+        logger.info("Background tasks already running in another worker")
+        return []
+    _lock_file = lock
+
+    tasks = [
+        asyncio.create_task(monitor_wallets()),
+        asyncio.create_task(execute_trades()),
+    ]
+    logger.info("Background tasks started: monitor + executor")
+    return tasks
@@ -1,18 +1,47 @@
 # app/config.py — 100% ENV-DRIVEN
-from pydantic import BaseModel
-import os
+from typing import Optional
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+class Settings(BaseSettings):
+    # Read once from the environment (or .env) at import; frozen so it's never re-read or mutated
+    model_config = SettingsConfigDict(frozen=True, env_file=".env", extra="ignore")
+
+    DATABASE_URL: str
+    SECRET_KEY: str = "change-me-now"
+    LOG_LEVEL: str = "INFO"
+    # Comma-separated Host header allow-list, e.g. "copytrader.up.railway.app,localhost"
+    ALLOWED_HOSTS: str = "*"
+    # Set to false where the schema is managed out-of-band — skips create_all/seeding on boot
+    DB_BOOTSTRAP: bool = True
+    # Touched after the first successful schema bootstrap — delete it to force a re-check
+    SCHEMA_SENTINEL: str = "/tmp/copytrader.schema_ok"
+    # Per worker — (size + overflow + 1 relay connection) × WEB_CONCURRENCY must fit under
+    # Postgres max_connections; startup refuses to run if it doesn't
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    # uvicorn worker count — the same default as the Dockerfile and Procfile
+    WEB_CONCURRENCY: int = 2
+    JINJA_CACHE_DIR: str = "/tmp/jinja_cache"
+    # flock'd by the one worker that runs the monitor/executor loops
+    BACKGROUND_LOCK: str = "/tmp/copytrader.background.lock"
+
+    # Seeded on first boot only — changing these later does not touch an existing admin
+    ADMIN_USERNAME: str = "admin"
+    ADMIN_PASSWORD: str = "admin123"
+    # argon2 cost for new hashes (passlib defaults); existing hashes carry their own parameters
+    ARGON2_ROUNDS: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    # Optional pre-computed argon2 hash; when set, the seed uses it and skips hashing ADMIN_PASSWORD
+    ADMIN_PASSWORD_HASH: Optional[str] = None
 
-class Settings(BaseModel):
-    DATABASE_URL: str = os.getenv("DATABASE_URL")
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "change-me-now")
-    
     # Bot settings — CHANGE THESE IN RAILWAY VARIABLES
-    GLOBAL_TRADING_MODE: str = os.getenv("TRADING_MODE", "TEST")  # TEST or LIVE
-    GLOBAL_TRADING_STATUS: str = os.getenv("BOT_STATUS", "STOPPED")  # RUNNING/STOPPED
-    DRY_RUN_ENABLED: bool = os.getenv("DRY_RUN", "true").lower() == "true"
-    
+    GLOBAL_TRADING_MODE: str = Field("TEST", validation_alias="TRADING_MODE")  # TEST or LIVE
+    GLOBAL_TRADING_STATUS: str = Field("STOPPED", validation_alias="BOT_STATUS")  # RUNNING/STOPPED
+    DRY_RUN_ENABLED: bool = Field(True, validation_alias="DRY_RUN")
+
     # Default balance (overridden by DB)
-    DEFAULT_PORTFOLIO_VALUE: float = float(os.getenv("DEFAULT_PORTFOLIO", "10019"))
-    DEFAULT_AVAILABLE_CASH: float = float(os.getenv("DEFAULT_CASH", "5920"))
+    DEFAULT_PORTFOLIO_VALUE: float = Field(10019, validation_alias="DEFAULT_PORTFOLIO")
+    DEFAULT_AVAILABLE_CASH: float = Field(5920, validation_alias="DEFAULT_CASH")
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,31 @@
+# app/crud.py
+import time
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import SettingsSingleton
+from app.schemas import SettingsOut
+
+# The settings row only changes through /api/bot/* and /api/settings; the TTL bounds how long
+# other workers (which don't see our invalidate) can serve the old row
+SETTINGS_TTL = 5.0
+SETTINGS_ID = 1
+_settings_row = None
+_settings_loaded_at = 0.0
+
+async def get_settings(db: AsyncSession) -> SettingsOut:
+    """Snapshot of the settings row, re-read at most every SETTINGS_TTL seconds."""
+    global _settings_row, _settings_loaded_at
+    now = time.monotonic()
+    if _settings_row is None or now - _settings_loaded_at > SETTINGS_TTL:
+        # Always the id=1 row (seeded at bootstrap) — a PK lookup, not a scan + LIMIT 1
+        row = await db.get(SettingsSingleton, SETTINGS_ID)
+        if row is None:
+            # Not seeded yet — don't cache the placeholder
+            return SettingsOut()
+        # A plain copy, not the ORM instance: that stays tied to this request's session, and a
+        # rollback there would expire it under every other request reading the cache
+        _settings_row, _settings_loaded_at = SettingsOut.model_validate(row), now
+    return _settings_row
+
+def invalidate_settings():
+    global _settings_row
+    _settings_row = None
@@ -1,14 +1,97 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import asyncio
+from typing import AsyncIterator
+
+from sqlalchemy import event, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 from .config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Railway/Heroku hand out plain postgres:// URLs — map them onto the async drivers
+_ASYNC_DRIVERS = {
+    "postgres://": "postgresql+asyncpg://",
+    "postgresql://": "postgresql+asyncpg://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+def async_url(url: str) -> str:
+    for prefix, driver in _ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return driver + url[len(prefix):]
+    return url
+
+DATABASE_URL = async_url(settings.DATABASE_URL)
+
+# SQLite (local dev / tests) runs without a queue pool, so sizing only applies to Postgres
+_pool_kwargs = {} if DATABASE_URL.startswith("sqlite") else {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_recycle": 1800,
+}
+
+# Larger compiled-statement cache so every hot select() stays compiled (default is 500)
+engine = create_async_engine(DATABASE_URL, pool_pre_ping=True, query_cache_size=1200, **_pool_kwargs)
+SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record):
+        # WAL lets dashboard reads run alongside writer commits; NORMAL syncs at checkpoints, not every commit
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        # Read pages straight from a 256MB mapping, keep 64MB of page cache, temp b-trees in RAM
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+def dialect_insert(table):
+    """INSERT construct for the active backend, so callers get .on_conflict_do_*()"""
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+async def check_connection_budget():
+    """Fail at boot, with the numbers, rather than with "too many clients" under load."""
+    if engine.dialect.name != "postgresql":
+        return
+    workers = settings.WEB_CONCURRENCY
+    # +1 per worker for the websocket relay's LISTEN connection
+    needed = (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW + 1) * workers
+    async with engine.connect() as conn:
+        max_connections = int((await conn.execute(text("SHOW max_connections"))).scalar())
+        reserved = int((await conn.execute(text("SHOW superuser_reserved_connections"))).scalar())
+    if needed > max_connections - reserved:
+        raise RuntimeError(
+            f"{workers} workers × (DB_POOL_SIZE={settings.DB_POOL_SIZE} + DB_MAX_OVERFLOW="
+            f"{settings.DB_MAX_OVERFLOW} + 1) = {needed} connections, but the server only allows "
+            f"{max_connections - reserved}; lower WEB_CONCURRENCY or the pool sizes"
+        )
+
+# Enough for the first requests; the rest of the pool opens on demand, so a boot
+# doesn't grab pool_size connections per worker all at once
+WARM_CONNECTIONS = 4
+
+async def warm_pool():
+    """Open a few pool connections up front so the first requests don't pay the connect."""
+    size = getattr(engine.pool, "size", None)
+    if size is None:  # NullPool/StaticPool (SQLite) — nothing to warm
+        return
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(min(size(), WARM_CONNECTIONS))))
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    # One commit per request: handlers flush() if they need generated IDs early
+    async with SessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
@@ -0,0 +1,16 @@
+# app/dependencies.py
+from fastapi import Request, HTTPException
+from fastapi.responses import Response
+
+# Pre-built header map for the post-form "back to dashboard" redirect. The Response
+# itself can't be shared: SessionMiddleware appends Set-Cookie to its raw headers in place.
+_HOME_HEADERS = {"location": "/"}
+
+def redirect_home() -> Response:
+    return Response(status_code=303, headers=_HOME_HEADERS)
+
+async def require_auth(request: Request):
+    # async so FastAPI calls it inline — a plain def dependency is sent to the threadpool on every request
+    if not request.user.is_authenticated:
+        raise HTTPException(status_code=307, headers={"Location": "/login"})
+    return True
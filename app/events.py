@@ -1,30 +1,75 @@
 # app/events.py
-from fastapi import WebSocket
-from typing import List
+import asyncio
+import logging
+from typing import Optional
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+from sqlalchemy import insert, text
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
+from app.db import SessionLocal
+from app.models import SystemEvent
+from app.sockets import manager
 
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+logger = logging.getLogger(__name__)
 
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            await connection.send_json(message)
+# SystemEvent rows are queued by request handlers and written in batches by write_events(),
+# so an admin action doesn't pay its own INSERT + commit
+EVENT_BATCH_SIZE = 100
+EVENT_BATCH_WINDOW = 0.2  # seconds
+_event_queue: Optional[asyncio.Queue] = None
 
-manager = ConnectionManager()
+def log_event(event_type: str, message: str, data: Optional[dict] = None):
+    if _event_queue is None:  # writer not running (scripts, tests without lifespan)
+        return
+    _event_queue.put_nowait({"event_type": event_type, "message": message, "data": data})
+
+async def _flush(batch):
+    async with SessionLocal() as db:
+        if db.bind.dialect.name == "postgresql":
+            # Audit log, not money: don't wait on the WAL fsync for these commits
+            await db.execute(text("SET LOCAL synchronous_commit TO OFF"))
+        await db.execute(insert(SystemEvent), batch)
+        await db.commit()
+
+async def write_events():
+    """Drains the queue: up to EVENT_BATCH_SIZE rows or EVENT_BATCH_WINDOW seconds per INSERT."""
+    global _event_queue
+    _event_queue = queue = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+    batch = []
+    try:
+        while True:
+            batch.append(await queue.get())
+            deadline = loop.time() + EVENT_BATCH_WINDOW
+            while len(batch) < EVENT_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await _flush(batch)
+            except Exception as e:
+                logger.error("Dropped %d system events: %s", len(batch), e)
+            batch = []
+    except asyncio.CancelledError:
+        # Shutdown: write whatever is still pending before the engine is disposed
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        if batch:
+            await _flush(batch)
+        raise
 
 async def emit_trade(trade, wallet):
     await manager.broadcast({
         "type": "new_trade",
         "wallet": wallet.nickname or wallet.address[:8],
-        "market": trade.market_id,
-        "outcome": trade.outcome,
-        "amount": trade.amount,
-        "price": trade.price
-    })
\ No newline at end of file
+        "market": trade["market_id"],
+        "outcome": trade["side"],
+        "amount": trade["size_usd"],
+        "price": trade["price"]
+    }, channel="trades")
+
+async def emit_bot_status(status):
+    await manager.broadcast({"type": "bot_status", "status": status}, channel="status")
@@ -1,25 +1,67 @@
 # app/executor.py
 import asyncio
-from app.models import LeaderTrade, FollowerTrade
-from app.db import get_db
+import logging
+from sqlalchemy import insert, select, update
+from app.crud import get_settings
+from app.models import LeaderTrade, FollowerTrade, TradeStats
+from app.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+COPY_FRACTION = 0.2  # 20% sizing
 
 async def execute_trades():
     while True:
-        db = next(get_db())
-        pending = db.query(LeaderTrade).filter(LeaderTrade.processed == False).limit(10).all()
-        for trade in pending:
-            # DRY RUN MODE
-            if getattr(settings, "DRY_RUN_ENABLED", True):
-                print(f"[DRY RUN] Would copy {trade.amount} on {trade.market_id}")
-            else:
-                print(f"[LIVE] EXECUTING COPY TRADE: {trade.amount} on {trade.market_id}")
-            
-            # Mark as processed
-            trade.processed = True
-            db.add(FollowerTrade(
-                leader_trade_id=trade.id,
-                amount=trade.amount * 0.2,  # 20% sizing
-                dry_run=True
-            ))
-        db.commit()
-        await asyncio.sleep(5)
\ No newline at end of file
+        async with SessionLocal() as db:
+            try:
+                # The DB row, not the env: /api/bot/{action} flips it (other workers see it within SETTINGS_TTL)
+                if (await get_settings(db)).global_trading_status == "RUNNING":
+                    await _copy_pending(db)
+            except Exception as e:
+                # A missing trade_stats table or a DB blip must not kill the loop for good
+                await db.rollback()
+                logger.warning("Error executing copy trades: %s", e)
+        await asyncio.sleep(5)
+
+async def _copy_pending(db):
+    """Copies up to 10 unprocessed leader trades as simulated follower trades, in one transaction."""
+    pending = (await db.execute(
+        select(
+            LeaderTrade.id, LeaderTrade.market_id, LeaderTrade.outcome_id,
+            LeaderTrade.side, LeaderTrade.size_usd, LeaderTrade.price,
+        ).where(LeaderTrade.processed.is_(False)).limit(10)
+    )).all()
+    follower_rows = []
+    for trade in pending:
+        size_usd = (trade.size_usd or 0.0) * COPY_FRACTION
+        # No order placement exists yet, so every copy is a dry run
+        logger.info("[DRY RUN] Would copy %s on %s", size_usd, trade.market_id)
+
+        follower_rows.append({
+            "leader_trade_id": trade.id,
+            "market_id": trade.market_id,
+            "outcome_id": trade.outcome_id,
+            "side": trade.side,
+            "size_usd": size_usd,
+            "price": trade.price,
+            "status": "simulated",
+            "dry_run": True,
+        })
+    if pending:
+        # Mark as processed and insert the copies as one statement each, not one per trade
+        await db.execute(
+            update(LeaderTrade)
+            .where(LeaderTrade.id.in_([trade.id for trade in pending]))
+            .values(processed=True)
+        )
+        await db.execute(insert(FollowerTrade), follower_rows)
+        # Same transaction as the inserts, so /api/stats never has to COUNT(*) follower_trades
+        await db.execute(
+            update(TradeStats)
+            .where(TradeStats.id == 1)
+            .values(
+                total_trades=TradeStats.total_trades + len(pending),
+                total_volume_usd=TradeStats.total_volume_usd + sum(r["size_usd"] for r in follower_rows),
+            )
+        )
+    await db.commit()
@@ -0,0 +1,27 @@
+# app/log.py
+import atexit
+import logging
+import logging.handlers
+import queue
+
+_listener = None
+
+def setup_logging(level: str):
+    """Log records are queued by the calling thread and written by one background
+    thread, so the event loop never blocks on a stderr write."""
+    global _listener
+    if _listener is not None:
+        return
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    root.addHandler(logging.handlers.QueueHandler(records))
+    # One INFO line per Polymarket poll otherwise
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _listener = logging.handlers.QueueListener(records, handler)
+    _listener.start()
+    # Flush whatever is still queued when the worker exits
+    atexit.register(_listener.stop)
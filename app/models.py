@@ -17,7 +17,8 @@ class LeaderWallet(Base):
     id = Column(Integer, primary_key=True)
     address = Column(String(44), unique=True, nullable=False, index=True)
     nickname = Column(String(100))
-    is_active = Column(Boolean, default=True)
+    # Monitor loop, dashboard and /api/stats all filter on it
+    is_active = Column(Boolean, default=True, index=True)
     added_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class LeaderTrade(Base):
@@ -46,7 +47,7 @@ class FollowerTrade(Base):
     size_usd = Column(Float)
     price = Column(Float)
     status = Column(String(20), default="executed")  # executed, failed, simulated
-    executed_at = Column(DateTime(timezone=True), server_default=func.now())
+    executed_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     dry_run = Column(Boolean, default=True)
 
 class Position(Base):
@@ -57,7 +58,7 @@ class Position(Base):
     size = Column(Float)
     avg_price = Column(Float)
     unrealized_pnl = Column(Float, default=0.0)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 class SystemEvent(Base):
     __tablename__ = "system_events"
@@ -65,7 +66,7 @@ class SystemEvent(Base):
     event_type = Column(String(50))  # trade_executed, risk_block, bot_start, etc.
     message = Column(Text)
     data = Column(JSON, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
 class SettingsSingleton(Base):
     __tablename__ = "settings"
@@ -74,4 +75,11 @@ class SettingsSingleton(Base):
     global_trading_status = Column(String(10), default="STOPPED")
     dry_run_enabled = Column(Boolean, default=True)
     risk_max_per_trade_pct = Column(Float, default=2.0)
-    risk_max_open_markets = Column(Integer, default=10)
\ No newline at end of file
+    risk_max_open_markets = Column(Integer, default=10)
+
+# Running totals, bumped in the same transaction that inserts follower trades
+class TradeStats(Base):
+    __tablename__ = "trade_stats"
+    id = Column(Integer, primary_key=True, default=1)
+    total_trades = Column(Integer, default=0, nullable=False)
+    total_volume_usd = Column(Float, default=0.0, nullable=False)
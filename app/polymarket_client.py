@@ -1,10 +1,14 @@
 # app/polymarket_client.py — WORKING VERSION
 import httpx
 
+# One pooled client for the whole process: polls reuse open TLS connections instead of handshaking
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=30, keepalive_expiry=75)
+
 class PolymarketClient:
     def __init__(self):
         self.client = httpx.AsyncClient(
             timeout=20.0,
+            limits=_LIMITS,
             headers={
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
                 "Origin": "https://polymarket.com",
@@ -31,4 +35,7 @@ class PolymarketClient:
             json={"query": query, "variables": variables}
         )
         resp.raise_for_status()
-        return resp.json().get("data", {}).get("trades", [])
\ No newline at end of file
+        return resp.json().get("data", {}).get("trades", [])
+
+    async def aclose(self):
+        await self.client.aclose()
@@ -0,0 +1,69 @@
+# app/schemas.py
+from datetime import datetime
+from typing import Any, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+class WalletOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    address: str
+    nickname: Optional[str] = None
+    is_active: bool
+    added_at: Optional[datetime] = None
+
+class WalletTradesOut(WalletOut):
+    trade_count: int
+
+class SettingsOut(BaseModel):
+    # Frozen: get_settings hands one cached instance to every request
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    # Optional because an unsaved SettingsSingleton() hasn't had column defaults applied yet
+    global_trading_mode: Optional[str] = None
+    global_trading_status: Optional[str] = None
+    dry_run_enabled: Optional[bool] = None
+    risk_max_per_trade_pct: Optional[float] = None
+    risk_max_open_markets: Optional[int] = None
+
+class SettingsUpdate(BaseModel):
+    # The only columns /api/settings may write; anything else in the body is rejected.
+    # global_trading_status is changed through /api/bot/{action}. Trading mode and dry-run
+    # stay out until the executor can place real orders — every copy is simulated for now
+    model_config = ConfigDict(extra="forbid")
+
+    risk_max_per_trade_pct: Optional[float] = Field(None, gt=0, le=100)
+    risk_max_open_markets: Optional[int] = Field(None, ge=1)
+
+class DashboardOut(BaseModel):
+    wallets: List[WalletOut]
+    settings: SettingsOut
+    active_count: int
+
+class StatsOut(BaseModel):
+    total_trades: int
+    trades_today: int
+    active_wallets: int
+    unrealized_pnl: float
+
+class FollowerTradeOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    leader_trade_id: Optional[int] = None
+    market_id: Optional[str] = None
+    side: Optional[str] = None
+    size_usd: Optional[float] = None
+    price: Optional[float] = None
+    status: Optional[str] = None
+    dry_run: Optional[bool] = None
+    executed_at: Optional[datetime] = None
+
+class SystemEventOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    event_type: Optional[str] = None
+    message: Optional[str] = None
+    data: Optional[Any] = None
+    created_at: Optional[datetime] = None
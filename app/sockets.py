@@ -1,33 +1,160 @@
 # app/sockets.py — FINAL WORKING VERSION
-from fastapi import WebSocket
-from typing import List
+import asyncio
+import itertools
+import logging
+from typing import Dict, List, Optional, Set
+
+import orjson
+from fastapi import WebSocket, status
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+from app.db import engine
+
+logger = logging.getLogger(__name__)
+
+# Clients pick channels with /ws?channels=trades,status — no param means all of them
+CHANNELS = ("trades", "status", "events")
+
+# Postgres NOTIFY channel that carries broadcasts between uvicorn workers
+RELAY_CHANNEL = "copytrader_ws"
+RELAY_PING_INTERVAL = 30.0  # seconds; catches half-open sockets that never report a close
+RELAY_RETRY_MAX = 30.0  # reconnect backoff ceiling, seconds
 
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.subscribers: Dict[str, Set[WebSocket]] = {channel: set() for channel in CHANNELS}
+        self._relay = None  # asyncpg connection LISTENing on RELAY_CHANNEL; None while it's down
+        self._relay_task: Optional[asyncio.Task] = None
+        self._relay_lock = asyncio.Lock()  # asyncpg runs one statement per connection at a time
+        self._outbox: List[str] = []  # notifications waiting for the next pg_notify batch
+        self._flush_task: Optional[asyncio.Task] = None
+        self._seq = itertools.count()
+        self._deliveries: Set[asyncio.Task] = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        requested = websocket.query_params.get("channels")
+        channels = CHANNELS if requested is None else requested.split(",")
+        for channel in channels:
+            if channel in self.subscribers:
+                self.subscribers[channel].add(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        for subscribers in self.subscribers.values():
+            subscribers.discard(websocket)
 
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections[:]:
+    async def _send(self, connection: WebSocket, payload: str):
+        try:
+            await connection.send_text(payload)
+        except Exception:
+            self.disconnect(connection)
+
+    async def _deliver(self, channel: str, payload: str):
+        # Sent concurrently so one slow socket doesn't hold up the rest
+        subscribers = self.subscribers.get(channel)
+        if subscribers:
+            await asyncio.gather(*(self._send(c, payload) for c in list(subscribers)))
+
+    async def broadcast(self, message: dict, channel: str):
+        payload = orjson.dumps(message).decode()  # encoded once for every client in every worker
+        if self._relay is None:
+            # SQLite / single process, or the relay is reconnecting: this worker's clients still get it
+            await self._deliver(channel, payload)
+            return
+        # Each worker only holds its own sockets — NOTIFY reaches all of them, this one included.
+        # The sequence number keeps Postgres from folding identical payloads into one notification
+        self._outbox.append(f"{channel}:{next(self._seq)}\n{payload}")
+        # done() rather than a field the task clears itself: under eager_task_factory the
+        # flush can finish inside create_task(), before the assignment below happens
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush())
+
+    async def _flush(self):
+        # Everything queued while a batch is in flight goes out in the next one, so a
+        # burst of trades costs one round-trip on the relay connection, not one per message
+        while self._outbox:
+            batch, self._outbox = self._outbox, []
+            relay = self._relay
             try:
-                await connection.send_json(message)
-            except:
-                self.disconnect(connection)
+                if relay is None:
+                    raise ConnectionError("relay is down")
+                async with self._relay_lock:
+                    await relay.execute(
+                        "SELECT pg_notify($1, n) FROM unnest($2::text[]) AS n", RELAY_CHANNEL, batch
+                    )
+            except Exception as e:
+                logger.warning("Websocket relay NOTIFY failed, delivering locally: %s", e)
+                for notification in batch:
+                    await self._deliver(*self._unpack(notification))
+
+    @staticmethod
+    def _unpack(notification: str):
+        header, _, payload = notification.partition("\n")
+        return header.partition(":")[0], payload
+
+    def _on_notify(self, _conn, _pid, _relay, notification: str):
+        task = asyncio.get_running_loop().create_task(self._deliver(*self._unpack(notification)))
+        self._deliveries.add(task)
+        task.add_done_callback(self._deliveries.discard)
+
+    async def _run_relay(self, dsn: str):
+        import asyncpg
+        delay = 1.0
+        while True:
+            lost = asyncio.Event()
+            try:
+                conn = await asyncpg.connect(dsn)
+                conn.add_termination_listener(lambda _conn: lost.set())
+                await conn.add_listener(RELAY_CHANNEL, self._on_notify)
+            except Exception as e:
+                logger.warning("Websocket relay unavailable, retrying in %.0fs: %s", delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RELAY_RETRY_MAX)
+                continue
+
+            self._relay, delay = conn, 1.0
+            logger.info("Websocket relay listening on %s", RELAY_CHANNEL)
+            try:
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), RELAY_PING_INTERVAL)
+                    except asyncio.TimeoutError:
+                        async with self._relay_lock:
+                            await asyncio.wait_for(conn.execute("SELECT 1"), RELAY_PING_INTERVAL)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Websocket relay ping failed: %s", e)
+            finally:
+                self._relay = None
+                conn.terminate()
+            logger.warning("Websocket relay connection lost — delivering locally until it reconnects")
+
+    async def start_relay(self):
+        """Multi-worker fan-out over Postgres LISTEN/NOTIFY; SQLite runs single-process without it."""
+        if engine.dialect.name != "postgresql":
+            return
+        dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        self._relay_task = asyncio.create_task(self._run_relay(dsn))
+
+    async def stop_relay(self):
+        if self._relay_task is not None:
+            self._relay_task.cancel()
+            await asyncio.gather(self._relay_task, return_exceptions=True)
+            self._relay_task = None
 
 manager = ConnectionManager()
 
 # This is the actual endpoint — NOT a decorator
 async def websocket_endpoint(websocket: WebSocket):
+    # AuthGate lets /ws through, so the trade feed checks the login session itself
+    if not websocket.session.get("authenticated"):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
     await manager.connect(websocket)
     try:
         while True:
-            data = await websocket.receive_text()
+            await websocket.receive_text()
     except Exception:
-        manager.disconnect(websocket)
\ No newline at end of file
+        manager.disconnect(websocket)
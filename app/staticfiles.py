@@ -0,0 +1,37 @@
+# app/staticfiles.py
+import stat
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+# Preferred first; the Docker build writes the .gz siblings (and .br if brotli is around)
+_PRECOMPRESSED = ((".br", "br"), (".gz", "gzip"))
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves a pre-built .br/.gz sibling when the client accepts it,
+    so assets aren't re-compressed per request, and lets browsers cache for a day."""
+
+    # "private": the mount sits inside SessionMiddleware, so responses can carry the session
+    # Set-Cookie — a shared proxy/CDN must not store and replay that to other users
+    cache_control = "private, max-age=86400"
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        for suffix, encoding in _PRECOMPRESSED:
+            if encoding not in accept:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                # Content type is guessed from "x.css.gz" → text/css; ETag/304 handling is inherited
+                response = self.file_response(full_path, stat_result, scope)
+                response.headers["Content-Encoding"] = encoding
+                response.headers.add_vary_header("Accept-Encoding")
+                response.headers["Cache-Control"] = self.cache_control
+                return response
+
+        response = await super().get_response(path, scope)
+        response.headers["Cache-Control"] = self.cache_control
+        return response
@@ -1,37 +1,68 @@
 # app/wallet_monitor.py
 import asyncio
-from datetime import datetime, timedelta
+import logging
+from datetime import datetime, timezone
+from sqlalchemy import select
 from app.polymarket_client import PolymarketClient
-from app.db import get_db
+from app.db import SessionLocal, dialect_insert
+from app.events import emit_trade
 from app.models import LeaderWallet, LeaderTrade
-from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
 
 client = PolymarketClient()
 
+# Caps in-flight wallet polls so a long wallet list can't exhaust the DB pool or trip API rate limits
+MAX_CONCURRENT_POLLS = 20
+_http_slots = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+
 async def monitor_wallets():
+    try:
+        await _poll_forever()
+    finally:
+        # Runs on shutdown cancellation so pooled keep-alive sockets are closed cleanly
+        await client.aclose()
+
+async def _poll_forever():
     while True:
-        db: Session = next(get_db())
-        wallets = db.query(LeaderWallet).filter(LeaderWallet.is_active == True).all()
-        
-        for wallet in wallets:
-            try:
-                trades = await client.get_recent_trades(wallet.address)
-                for trade in trades:
-                    if not db.query(LeaderTrade).filter(LeaderTrade.external_id == trade["id"]).first():
-                        new_trade = LeaderTrade(
-                            wallet_id=wallet.id,
-                            external_id=trade["id"],
-                            market_id=trade["market"]["id"],
-                            outcome=trade["outcome"],
-                            amount=float(trade["amount"]),
-                            price=float(trade["price"]),
-                            timestamp=datetime.fromtimestamp(int(trade["timestamp"])/1000)
-                        )
-                        db.add(new_trade)
-                        from app.events import emit_trade
-                        await emit_trade(new_trade, wallet)
-                db.commit()
-            except Exception as e:
-                print(f"Error monitoring {wallet.address}: {e}")
-        
-        await asyncio.sleep(15)  # Check every 15 seconds
\ No newline at end of file
+        async with SessionLocal() as db:
+            wallets = (await db.execute(select(LeaderWallet).where(LeaderWallet.is_active.is_(True)))).scalars().all()
+        # Wallets are polled concurrently: a cycle takes about one API round-trip, not one per wallet
+        await asyncio.gather(*(_check_wallet(wallet) for wallet in wallets))
+        await asyncio.sleep(15)  # Check every 15 seconds
+
+async def _check_wallet(wallet):
+    # Own session per wallet — an AsyncSession can't be shared between concurrent tasks
+    async with _http_slots, SessionLocal() as db:
+        try:
+            trades = await client.get_recent_trades(wallet.address)
+            if not trades:
+                return
+            rows = [
+                {
+                    "wallet_id": wallet.id,
+                    "external_trade_id": trade["id"],
+                    "market_id": trade["market"]["id"],
+                    "side": trade["outcome"],
+                    "size_usd": float(trade["amount"]),
+                    "price": float(trade["price"]),
+                    "executed_at": datetime.fromtimestamp(int(trade["timestamp"])/1000, tz=timezone.utc),
+                    "raw_data": trade,
+                }
+                for trade in trades
+            ]
+            # One multi-row INSERT; already-seen trades are skipped by the unique key
+            # instead of a SELECT per trade, and RETURNING tells us which ones are new
+            inserted = set((await db.execute(
+                dialect_insert(LeaderTrade)
+                .on_conflict_do_nothing(index_elements=["external_trade_id"])
+                .returning(LeaderTrade.external_trade_id),
+                rows,
+            )).scalars())
+            await db.commit()
+            for row in rows:
+                if row["external_trade_id"] in inserted:
+                    await emit_trade(row, wallet)
+        except Exception as e:
+            await db.rollback()
+            logger.warning("Error monitoring %s: %s", wallet.address, e)
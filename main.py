@@ -1,99 +1,262 @@
 # app/main.py — FINAL SAFE VERSION (NO DATA LOSS EVER)
-from fastapi import FastAPI, Request, Depends, Form, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+import asyncio
+import fcntl
+import logging
+import os
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+
+from fastapi import FastAPI, Request, Depends
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import func, inspect, text, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.middleware.authentication import AuthenticationMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-from sqlalchemy import inspect, text
-from sqlalchemy.orm import Session
-from app.db import get_db, Base, engine
-from app.models import User, LeaderWallet, SettingsSingleton
-from app.config import settings
-from passlib.handlers.argon2 import argon2
+
+from app.api import (
+    dashboard as dashboard_api, settings as settings_api, status as status_api, wallets as wallets_api,
+)
+from app.auth import AuthGate, SessionAuthBackend, hash_password_async, verify_password_async
 from app.background import start_background_tasks
-from app.sockets import websocket_endpoint
-
-print("Starting Polymarket Copytrader...")
-
-# SAFE DATABASE INITIALIZATION
-inspector = inspect(engine)
-
-# 1. Create tables if they don't exist
-if not inspector.has_table("users"):
-    print("First run → creating tables + admin")
-    Base.metadata.create_all(bind=engine)
-    with Session(engine) as db:
-        db.add(User(username="admin", password_hash=argon2.hash("admin123")))
-        db.add(SettingsSingleton())
-        db.commit()
-    print("Admin created → admin / admin123")
-else:
-    print("Database exists — checking for missing columns...")
-
-    # 2. FIX: Add 'processed' column to leader_trades if missing
-    if inspector.has_table("leader_trades"):
-        columns = [col["name"] for col in inspector.get_columns("leader_trades")]
-        if "processed" not in columns:
-            print("Adding missing 'processed' column to leader_trades...")
-            with engine.connect() as conn:
+from app.config import settings
+from app.crud import get_settings
+from app.db import get_db, check_connection_budget, dialect_insert, warm_pool, Base, engine
+from app.dependencies import redirect_home
+from app.events import write_events
+from app.log import setup_logging
+from app.models import FollowerTrade, User, LeaderWallet, SettingsSingleton, TradeStats
+from app.sockets import manager, websocket_endpoint
+from app.staticfiles import PrecompressedStaticFiles
+
+setup_logging(settings.LOG_LEVEL)
+logger = logging.getLogger("copytrader")
+logger.info("Starting Polymarket Copytrader...")
+
+# SAFE DATABASE INITIALIZATION — runs on the sync side of the async engine
+def init_db(conn):
+    """Returns False when another worker already did the bootstrap while we waited."""
+    if conn.dialect.name == "postgresql":
+        # Lock is held until this transaction ends. Losers of the race just wait for the
+        # winner to finish and skip the catalog scan instead of repeating it.
+        got_lock = conn.execute(text("SELECT pg_try_advisory_xact_lock(hashtext('schema_bootstrap'))")).scalar()
+        if not got_lock:
+            logger.info("Another worker is bootstrapping the schema — waiting for it")
+            conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('schema_bootstrap'))"))
+            return False
+
+    inspector = inspect(conn)
+
+    # 1. Create tables if they don't exist
+    if not inspector.has_table("users"):
+        logger.info("First run → creating tables")
+        Base.metadata.create_all(bind=conn)
+    else:
+        logger.info("Database exists — checking for missing columns...")
+
+        # 2. FIX: Add 'processed' column to leader_trades if missing
+        if inspector.has_table("leader_trades"):
+            columns = [col["name"] for col in inspector.get_columns("leader_trades")]
+            if "processed" not in columns:
+                logger.info("Adding missing 'processed' column to leader_trades...")
                 conn.execute(text("ALTER TABLE leader_trades ADD COLUMN processed BOOLEAN DEFAULT FALSE"))
-                conn.commit()
-            print("Fixed: leader_trades.processed column added")
+                logger.info("Fixed: leader_trades.processed column added")
+
+        # 3. Tables and indexes added to the models after the database was first created
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                logger.info("Adding missing table %s...", table.name)
+                table.create(conn)
+                continue
+            existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    logger.info("Adding missing index %s...", index.name)
+                    index.create(conn)
+    return True
+
+async def seed_defaults(conn):
+    # 4. Seed admin + settings/stats rows — argon2 only runs when the admin row is actually missing
+    admin = await conn.execute(select(User.id).where(User.username == settings.ADMIN_USERNAME))
+    if admin.first() is None:
+        admin_hash = settings.ADMIN_PASSWORD_HASH or await hash_password_async(settings.ADMIN_PASSWORD)
+        await conn.execute(
+            dialect_insert(User)
+            .values(username=settings.ADMIN_USERNAME, password_hash=admin_hash)
+            .on_conflict_do_nothing(index_elements=["username"])
+        )
+        logger.info("Admin created → %s", settings.ADMIN_USERNAME)
+    await conn.execute(
+        dialect_insert(SettingsSingleton).values(id=1).on_conflict_do_nothing(index_elements=["id"])
+    )
+    # Counters start from whatever is already in follower_trades, then only move incrementally
+    await conn.execute(
+        dialect_insert(TradeStats)
+        .values(
+            id=1,
+            total_trades=select(func.count(FollowerTrade.id)).scalar_subquery(),
+            total_volume_usd=select(func.coalesce(func.sum(FollowerTrade.size_usd), 0.0)).scalar_subquery(),
+        )
+        .on_conflict_do_nothing(index_elements=["id"])
+    )
+
+async def bootstrap_schema():
+    # Sentinel skips the information_schema scan on steady-state restarts;
+    # the flock makes sure only one worker bootstraps while the others wait
+    with open(settings.SCHEMA_SENTINEL + ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if os.path.exists(settings.SCHEMA_SENTINEL):
+            logger.info("Schema already bootstrapped — skipping checks")
+            return
+        async with engine.begin() as conn:
+            if await conn.run_sync(init_db):
+                await seed_defaults(conn)
+        open(settings.SCHEMA_SENTINEL, "w").close()
 
-print("Bot ready — go to /login")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 3.12+: tasks that finish without suspending (e.g. broadcasts with no clients) skip the scheduler
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    if settings.DB_BOOTSTRAP:
+        await bootstrap_schema()
+    else:
+        logger.info("DB_BOOTSTRAP disabled — assuming the schema is already in place")
+    await check_connection_budget()
+    # Open the pool's connections before the first request instead of during it
+    await warm_pool()
+    logger.info("Bot ready — go to /login")
+    # Every worker writes its own queued events; only one runs the monitor/executor
+    event_writer = asyncio.create_task(write_events())
+    # Websocket broadcasts from any worker reach the clients connected to every worker
+    await manager.start_relay()
+    tasks = start_background_tasks()
+    yield
+    for task in tasks:
+        task.cancel()
+    event_writer.cancel()
+    await asyncio.gather(event_writer, *tasks, return_exceptions=True)
+    await manager.stop_relay()
+    await engine.dispose()
 
 # APP SETUP
-app = FastAPI()
-app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 templates = Jinja2Templates(directory="app/templates")
+# Compiled templates survive restarts via the bytecode cache; no per-render mtime checks
+os.makedirs(settings.JINJA_CACHE_DIR, exist_ok=True)
+templates.env.bytecode_cache = FileSystemBytecodeCache(settings.JINJA_CACHE_DIR)
+templates.env.auto_reload = False
+# Resolved once at import so the first request after boot doesn't pay parse + compile
+LOGIN_TMPL = templates.get_template("login.html")
+DASHBOARD_TMPL = templates.get_template("dashboard.html")
+
+# Middleware — last added runs first, so the session is decoded before auth reads it
+app.add_middleware(AuthenticationMiddleware, backend=SessionAuthBackend())
+app.add_middleware(AuthGate)
+app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
+# The ~28KB dashboard page shrinks several-fold; tiny JSON bodies stay raw
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+# Very first check: scanner traffic with a foreign Host header is turned away before anything else runs
+app.add_middleware(
+    TrustedHostMiddleware, allowed_hosts=[h.strip() for h in settings.ALLOWED_HOSTS.split(",") if h.strip()]
+)
+
+# Routes
+app.mount("/static", PrecompressedStaticFiles(directory="app/static"), name="static")
 app.add_api_websocket_route("/ws", websocket_endpoint)
+app.include_router(dashboard_api.router)
+app.include_router(settings_api.router)
+app.include_router(status_api.router)
+app.include_router(wallets_api.router)
 
-@app.on_event("startup")
-async def startup():
-    start_background_tasks()
 
-def require_auth(request: Request):
-    if not request.session.get("authenticated"):
-        raise HTTPException(status_code=307, headers={"Location": "/login"})
-    return True
+# Pre-encoded: load balancers poll this constantly, so skip validation and JSON encoding
+_HEALTH_BODY = b'{"status":"healthy"}'
+
+@app.get("/health")
+async def health():
+    return Response(_HEALTH_BODY, media_type="application/json")
+
+_LOGIN_CACHE_HEADERS = {"Cache-Control": "private, max-age=300"}
+
+# The login page has no per-request inputs, so it's rendered once and served as bytes
+_LOGIN_HTML = LOGIN_TMPL.render({"request": None}).encode()
 
 @app.get("/login")
-async def login_page(request: Request):
-    return templates.TemplateResponse("login.html", {"request": request})
+async def login_page():
+    # Identical for every visitor; "private" because SessionMiddleware may attach a Set-Cookie
+    return HTMLResponse(_LOGIN_HTML, headers=_LOGIN_CACHE_HEADERS)
 
 @app.post("/login")
-async def login(request: Request, db: Session = Depends(get_db)):
+async def login(request: Request, db: AsyncSession = Depends(get_db)):
     form = await request.form()
-    user = db.query(User).filter(User.username == form.get("username")).first()
-    if user and argon2.verify(form.get("password", ""), user.password_hash):
+    password_hash = (await db.execute(
+        select(User.password_hash).where(User.username == form.get("username"))
+    )).scalar_one_or_none()
+    if await verify_password_async(form.get("password", ""), password_hash):
         request.session["authenticated"] = True
-        return RedirectResponse("/", status_code=303)
-    return templates.TemplateResponse("login.html", {"request": request, "error": "Invalid credentials"})
+        request.session["username"] = form.get("username")
+        return redirect_home()
+    return HTMLResponse(LOGIN_TMPL.render({"request": request, "error": "Invalid credentials"}))
+
+# Dashboard values that don't depend on the request or DB — built once, read-only
+_STATIC_CTX = MappingProxyType({
+    "stats": {"total_trades": 0, "profitable_trades": 0, "total_pnl": 0.0, "win_rate": 0.0},
+    "risk_settings": {"copy_percentage": 20},
+    "bot_settings": {},
+    "balances": {
+        "available_cash": settings.DEFAULT_AVAILABLE_CASH,
+        "portfolio_value": settings.DEFAULT_PORTFOLIO_VALUE,
+    },
+    "risk_level": "Low",
+    "risk_status": "All systems normal",
+    "daily_pnl": 0.0,
+    "trades_today": 0,
+})
 
 @app.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request, db: Session = Depends(get_db), _: bool = Depends(require_auth)):
-    s = db.query(SettingsSingleton).first() or SettingsSingleton()
-    
+async def dashboard(request: Request, db: AsyncSession = Depends(get_db)):
+    # Plain return instead of require_auth's HTTPException — no exception unwind on the page route
+    if not request.user.is_authenticated:
+        return RedirectResponse("/login", status_code=307)
+
+    # One AsyncSession can only run one statement at a time, so these stay sequential
+    s = await get_settings(db)
+    wallets = (await db.execute(select(LeaderWallet))).scalars().all()
+    # Counted from the rows we already have rather than a second COUNT(*) round-trip
+    active_wallets_count = sum(1 for w in wallets if w.is_active)
+
     context = {
         "request": request,
-        "leader-offset": db.query(LeaderWallet).all(),
-        "active_wallets_count": db.query(LeaderWallet).filter(LeaderWallet.is_active == True).count(),
+        "leader_wallets": wallets,
+        "active_wallets_count": active_wallets_count,
         "s": s,  # This gives you all settings in template
-        "stats": {"total_trades": 0, "profitable_trades": 0, "total_pnl": 0.0, "win_rate": 0.0},
-        "risk_settings": {"copy_percentage": getattr(s, "copy_percentage", 20)},
-        "balances": {
-            "available_cash": getattr(s, "available_cash", 5920),
-            "portfolio_value": getattr(s, "portfolio_value", 10019)
-        },
-        "risk_level": "Low",
-        "risk_status": "All systems normal",
-        "daily_pnl": 0.0,
-        "trades_today": 0,
+        "bot_status": s.global_trading_status,
+        "trading_mode": s.global_trading_mode,
+        "dry_run": s.dry_run_enabled,
+        **_STATIC_CTX,
     }
-    return templates.TemplateResponse("dashboard.html", context)
+    return HTMLResponse(DASHBOARD_TMPL.render(context))
 
 @app.get("/logout")
 async def logout(request: Request):
     request.session.clear()
-    return RedirectResponse("/login")
\ No newline at end of file
+    return RedirectResponse("/login")
+
+if __name__ == "__main__":
+    # Local runs get the same loop/parser as the Dockerfile and Procfile
+    import uvicorn
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        workers=settings.WEB_CONCURRENCY,
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+        log_level="warning",
+    )
@@ -1,27 +1,37 @@
 # reset_admin.py — RUN THIS ONCE
+# Usage: RESET_ADMIN=1 python reset_admin.py   (or: python reset_admin.py --reset-admin)
+import asyncio
 import os
+import sys
+from sqlalchemy import delete
 from app.db import SessionLocal, engine, Base
 from app.models import User
-from passlib.context import CryptContext
+from app.auth import hash_password
 
-# Force create tables
-Base.metadata.create_all(bind=engine)
+async def main():
+    # Force create tables
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-db = SessionLocal()
+    async with SessionLocal() as db:
+        # Only the admin row — other users are left alone
+        await db.execute(delete(User).where(User.username == "admin"))
 
-# DELETE ANY OLD USERS
-db.query(User).delete()
-db.commit()
+        # CREATE NEW ADMIN WITH PASSWORD "1234"
+        hashed = hash_password("1234")
+        admin = User(username="admin", password_hash=hashed)
+        db.add(admin)
+        await db.commit()
 
-# CREATE NEW ADMIN WITH PASSWORD "1234"
-hashed = pwd_context.hash("1234")
-admin = User(username="admin", hashed_password=hashed)
-db.add(admin)
-db.commit()
-db.close()
+    await engine.dispose()
+
+if os.getenv("RESET_ADMIN") != "1" and "--reset-admin" not in sys.argv:
+    print("Refusing to reset the admin user without RESET_ADMIN=1 or --reset-admin")
+    sys.exit(1)
+
+asyncio.run(main())
 
 print("SUCCESS: Admin user created!")
 print("Username: admin")
 print("Password: 1234")
-print("You can now login at your domain!")
\ No newline at end of file
+print("You can now login at your domain!")
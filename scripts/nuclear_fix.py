@@ -1,13 +1,12 @@
 # scripts/nuclear_fix.py — FINAL FIX FOR RAILWAY (works 100%)
-from sqlalchemy import text
+import asyncio
+from sqlalchemy import select, text
 from app.db import engine
 from app.models import User
-from passlib.handlers.argon2 import argon2
+from app.auth import hash_password
 from sqlalchemy.orm import Session
 
-print("NUCLEAR FIX STARTED — THIS WILL WORK")
-
-with engine.connect() as conn:
+def add_columns(conn):
     # FORCE ADD password_hash column
     print("Adding password_hash column...")
     conn.execute(text("""
@@ -16,26 +15,38 @@ with engine.connect() as conn:
         ADD COLUMN IF NOT EXISTS username TEXT UNIQUE,
         ADD COLUMN IF NOT EXISTS password_hash TEXT
     """))
-    conn.commit()
     print("Column added!")
 
-# Now create admin user
-print("Creating admin user...")
-with Session(engine) as db:
-    try:
-        if not db.query(User).filter(User.username == "admin").first():
-            db.add(User(username="admin", password_hash=argon2.hash("admin123")))
-            db.commit()
+def create_admin(conn):
+    print("Creating admin user...")
+    with Session(bind=conn) as db:
+        if not db.scalars(select(User).where(User.username == "admin")).first():
+            db.add(User(username="admin", password_hash=hash_password("admin123")))
+            db.flush()
             print("SUCCESS: Admin created → admin / admin123")
         else:
             print("Admin already exists")
+
+async def main():
+    async with engine.begin() as conn:
+        await conn.run_sync(add_columns)
+
+    # Now create admin user
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(create_admin)
     except Exception as e:
         print(f"Error creating user: {e}")
-        db.rollback()
+
+    await engine.dispose()
+
+print("NUCLEAR FIX STARTED — THIS WILL WORK")
+
+asyncio.run(main())
 
 print("")
 print("NUCLEAR FIX COMPLETE!")
 print("Go to your app and login:")
 print("   Username: admin")
 print("   Password: admin123")
-print("YOU ARE NOW LIVE")
\ No newline at end of file
+print("YOU ARE NOW LIVE")
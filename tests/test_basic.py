@@ -1,28 +1,53 @@
+import asyncio
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from starlette.websockets import WebSocketDisconnect
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
-from app.database import get_db
-from app.models import Base
+from app import executor, wallet_monitor
+from app.auth import hash_password
+from app.crud import get_settings, invalidate_settings
+from app.db import SessionLocal, engine as app_engine, get_db
+from app.sockets import ConnectionManager
+from app.models import (
+    Base, FollowerTrade, LeaderTrade, LeaderWallet, SettingsSingleton, SystemEvent, TradeStats, User,
+)
 from main import app
 
 # Test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL)
+TestingSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
+async def override_get_db():
+    async with TestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 app.dependency_overrides[get_db] = override_get_db
 
 client = TestClient(app)
 
+# Fresh schema + admin/settings/stats rows, written synchronously to the same file
+sync_engine = create_engine("sqlite:///./test.db")
+Base.metadata.drop_all(sync_engine)
+Base.metadata.create_all(sync_engine)
+with sync_engine.begin() as conn:
+    conn.execute(insert(User).values(username="admin", password_hash=hash_password("admin123")))
+    conn.execute(insert(SettingsSingleton).values(id=1))
+    conn.execute(insert(TradeStats).values(id=1))
+
+@pytest.fixture
+def auth_client():
+    authed = TestClient(app)
+    response = authed.post("/login", data={"username": "admin", "password": "admin123"}, follow_redirects=False)
+    assert response.status_code == 303
+    return authed
+
 def test_health_check():
     response = client.get("/health")
     assert response.status_code == 200
@@ -34,5 +59,220 @@ def test_login_page():
     assert response.status_code == 200
 
 def test_protected_routes_require_auth():
-    response = client.get("/dashboard")
+    response = client.get("/", follow_redirects=False)
     assert response.status_code == 307  # Redirect to login
+
+def test_api_requires_session():
+    response = client.get("/api/stats", follow_redirects=False)
+    assert response.status_code == 307
+    assert response.headers["location"] == "/login"
+
+def test_events_keyset_pagination(auth_client):
+    with sync_engine.begin() as conn:
+        conn.execute(insert(SystemEvent), [{"event_type": "test", "message": str(i)} for i in range(60)])
+    first = auth_client.get("/api/events").json()
+    assert len(first) == 50
+    ids = [event["id"] for event in first]
+    assert ids == sorted(ids, reverse=True)
+    rest = auth_client.get("/api/events", params={"after_id": ids[-1]}).json()
+    assert len(rest) == 10
+    assert all(event["id"] < ids[-1] for event in rest)
+
+def test_trades_keyset_pagination(auth_client):
+    with sync_engine.begin() as conn:
+        conn.execute(insert(FollowerTrade), [
+            {"market_id": "m1", "side": "YES", "size_usd": float(i), "price": 0.5, "status": "simulated"}
+            for i in range(55)
+        ])
+    first = auth_client.get("/api/trades").json()
+    assert len(first) == 50
+    assert first[0]["market_id"] == "m1"
+    rest = auth_client.get("/api/trades", params={"after_id": first[-1]["id"]}).json()
+    assert len(rest) == 5
+    assert all(trade["id"] < first[-1]["id"] for trade in rest)
+
+def test_bot_start_twice_is_rejected(auth_client):
+    auth_client.post("/api/bot/stop")  # 200 or 400, depending on the current state
+    assert auth_client.post("/api/bot/start").status_code == 200
+    assert auth_client.post("/api/bot/start").status_code == 400
+    assert auth_client.post("/api/bot/stop").status_code == 200
+
+def test_stats_etag_not_modified(auth_client):
+    response = auth_client.get("/api/stats")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    again = auth_client.get("/api/stats", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+def test_settings_update_rejects_non_whitelisted_keys(auth_client):
+    assert auth_client.post("/api/settings", json={"global_trading_status": "RUNNING"}).status_code == 422
+    assert auth_client.post("/api/settings", json={"is_admin": True}).status_code == 422
+    assert auth_client.post("/api/settings", json={"dry_run_enabled": False}).status_code == 422
+    response = auth_client.post("/api/settings", json={"risk_max_open_markets": 10})
+    assert response.status_code == 200
+    assert response.json() == {"updated": ["risk_max_open_markets"]}
+
+def test_check_wallet_emits_only_new_trades(monkeypatch):
+    with sync_engine.begin() as conn:
+        wallet_id = conn.execute(
+            insert(LeaderWallet).values(address="0x" + "a" * 40).returning(LeaderWallet.id)
+        ).scalar_one()
+    fetches = iter([["t1", "t2"], ["t2", "t3"]])
+
+    async def fake_recent_trades(address, limit=50):
+        return [
+            {"id": trade_id, "market": {"id": "m1"}, "outcome": "YES",
+             "amount": "10", "price": "0.5", "timestamp": "1700000000000"}
+            for trade_id in next(fetches)
+        ]
+
+    emitted = []
+
+    async def fake_emit(trade, wallet):
+        emitted.append(trade["external_trade_id"])
+
+    monkeypatch.setattr(wallet_monitor.client, "get_recent_trades", fake_recent_trades)
+    monkeypatch.setattr(wallet_monitor, "emit_trade", fake_emit)
+
+    async def poll_twice():
+        wallet = LeaderWallet(id=wallet_id, address="0x" + "a" * 40)
+        await wallet_monitor._check_wallet(wallet)
+        await wallet_monitor._check_wallet(wallet)
+        await app_engine.dispose()
+
+    asyncio.run(poll_twice())
+    assert emitted == ["t1", "t2", "t3"]
+    with sync_engine.connect() as conn:
+        stored = conn.execute(select(LeaderTrade.external_trade_id).where(LeaderTrade.wallet_id == wallet_id))
+        assert sorted(stored.scalars()) == ["t1", "t2", "t3"]
+
+def test_add_wallet_validates_and_ignores_duplicates(auth_client):
+    address = "0x" + "b" * 40
+
+    def wallet_count():
+        with sync_engine.connect() as conn:
+            return len(conn.execute(select(LeaderWallet.id)).all())
+
+    before = wallet_count()
+    for invalid in ("0x1234", "0x" + "g" * 40, "b" * 40):
+        response = auth_client.post("/api/wallets/add", data={"address": invalid}, follow_redirects=False)
+        assert response.status_code == 303
+    assert wallet_count() == before
+
+    for submitted in (address, address.upper().replace("0X", "0x")):
+        response = auth_client.post("/api/wallets/add", data={"address": submitted}, follow_redirects=False)
+        assert response.status_code == 303
+    assert wallet_count() == before + 1
+
+def test_list_wallets_counts_trades(auth_client):
+    with sync_engine.begin() as conn:
+        busy, idle = conn.execute(
+            insert(LeaderWallet).returning(LeaderWallet.id),
+            [{"address": "0x" + "c" * 40, "is_active": True}, {"address": "0x" + "d" * 40, "is_active": False}],
+        ).scalars().all()
+        conn.execute(insert(LeaderTrade), [
+            {"wallet_id": busy, "external_trade_id": f"list-{i}", "market_id": "m1"} for i in range(3)
+        ])
+    wallets = {wallet["id"]: wallet for wallet in auth_client.get("/api/wallets").json()}
+    assert wallets[busy]["trade_count"] == 3
+    assert wallets[idle]["trade_count"] == 0
+    assert wallets[idle]["is_active"] is False
+
+def test_dashboard_api(auth_client):
+    response = auth_client.get("/api/dashboard")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, max-age=5"
+    data = response.json()
+    assert data["settings"]["global_trading_mode"] in ("TEST", "LIVE")
+    assert data["active_count"] == sum(1 for wallet in data["wallets"] if wallet["is_active"])
+
+def test_broadcast_after_failed_relay_flush():
+    class BrokenRelay:
+        async def execute(self, *args):
+            raise ConnectionError("connection is closed")
+
+    class FakeSocket:
+        def __init__(self):
+            self.sent = []
+
+        async def send_text(self, payload):
+            self.sent.append(payload)
+
+    async def run():
+        # Same task factory the lifespan installs, where available — flushes may finish eagerly
+        if hasattr(asyncio, "eager_task_factory"):
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        manager = ConnectionManager()
+        socket = FakeSocket()
+        manager.subscribers["trades"].add(socket)
+        manager._relay = BrokenRelay()
+        for n in range(3):
+            await manager.broadcast({"n": n}, "trades")
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        return socket.sent, manager._outbox
+
+    sent, outbox = asyncio.run(run())
+    assert sent == ['{"n":0}', '{"n":1}', '{"n":2}']
+    assert outbox == []
+
+def test_cached_settings_survive_a_rollback():
+    async def run():
+        invalidate_settings()
+        async with SessionLocal() as db:
+            cached = await get_settings(db)
+            await db.rollback()  # what get_db does when the request that loaded it fails
+        async with SessionLocal() as db:
+            again = await get_settings(db)
+        await app_engine.dispose()
+        return cached, again
+
+    cached, again = asyncio.run(run())
+    assert again is cached
+    assert cached.global_trading_mode == "TEST"
+
+def test_websocket_requires_session(auth_client):
+    with pytest.raises(WebSocketDisconnect) as rejected:
+        with client.websocket_connect("/ws"):
+            pass
+    assert rejected.value.code == 1008
+    with auth_client.websocket_connect("/ws?channels=status"):
+        pass
+
+def test_executor_copies_only_while_running():
+    with sync_engine.begin() as conn:
+        leader_id = conn.execute(
+            insert(LeaderTrade).values(external_trade_id="exec-1", market_id="m2", size_usd=50.0)
+            .returning(LeaderTrade.id)
+        ).scalar_one()
+
+    def copies():
+        with sync_engine.connect() as conn:
+            return conn.execute(
+                select(FollowerTrade.status, FollowerTrade.dry_run, FollowerTrade.size_usd)
+                .where(FollowerTrade.leader_trade_id == leader_id)
+            ).all()
+
+    def set_status(status):
+        with sync_engine.begin() as conn:
+            conn.execute(update(SettingsSingleton).values(global_trading_status=status))
+        invalidate_settings()
+
+    async def run_briefly():
+        task = asyncio.create_task(executor.execute_trades())
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await app_engine.dispose()
+
+    set_status("STOPPED")
+    asyncio.run(run_briefly())
+    assert copies() == []
+
+    set_status("RUNNING")
+    try:
+        asyncio.run(run_briefly())
+    finally:
+        set_status("STOPPED")
+    assert copies() == [("simulated", True, 10.0)]